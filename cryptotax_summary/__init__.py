@@ -1 +1 @@
-from .crypto_summary import calculate_crypto_summary
\ No newline at end of file
+from .crypto_summary import calculate_crypto_summary, calculate_crypto_summary_from_dataframe
\ No newline at end of file
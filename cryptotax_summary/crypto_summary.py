@@ -1,59 +1,359 @@
+import numpy as np
 import pandas as pd
+import functools
+import importlib.util
 import os
 import sys
-from datetime import datetime
+import logging
 import argparse
 
-def classify_holding_period(date_acquired_str, date_disposed_str):
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa_csv = None
+
+# Numba and Polars only handle large inputs, so they are imported on first use rather than with this module
+HAS_NUMBA = importlib.util.find_spec('numba') is not None
+HAS_POLARS = importlib.util.find_spec('polars') is not None
+
+logger = logging.getLogger(__name__)
+
+# Define strictly required columns (excluding 'Holding period (Days)') and the aliases they may appear under
+REQUIRED_COLUMNS = {
+    'Transaction Type': ['Transaction Type', 'Trade Type', 'Type'],
+    'Transaction ID': ['Transaction ID', 'Trade ID', 'ID'],
+    'Tax lot ID': ['Tax lot ID', 'Lot ID', 'Tax Lot'],
+    'Asset name': ['Asset name', 'Currency', 'Symbol'],
+    'Amount': ['Amount', 'Quantity'],
+    'Date Acquired': ['Date Acquired', 'Acquisition Date', 'Bought Date'],
+    'Cost basis (USD)': ['Cost basis (USD)', 'Cost Basis', 'Purchase Price (USD)'],
+    'Date of Disposition': ['Date of Disposition', 'Disposition Date', 'Sold Date'],
+    'Proceeds (USD)': ['Proceeds (USD)', 'Sale Proceeds', 'Sale Price (USD)'],
+    'Gains (Losses) (USD)': ['Gains (Losses) (USD)', 'Gain/Loss (USD)', 'Profit/Loss (USD)'],
+    'Data source': ['Data source', 'Source', 'Exchange']
+}
+
+# Normalized (stripped, lowercased) alias -> standard column name
+ALIAS_LOOKUP = {
+    alias.strip().lower(): std_col
+    for std_col, aliases in REQUIRED_COLUMNS.items()
+    for alias in aliases
+}
+
+# Arrays with at least this many rows have their gains split by the Numba kernel when Numba is installed;
+# below it, the NumPy masked sums are faster than importing Numba and loading the compiled kernel
+NUMBA_MIN_ROWS = 1_000_000
+
+# Files at least this large (in bytes) are summarized with Polars' lazy engine when Polars is installed
+POLARS_MIN_FILE_SIZE = 100 * 1024 * 1024
+
+# Strings pandas' read_csv reads as NaN by default; the Polars query treats them as null to match
+PANDAS_NA_VALUES = [
+    '', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+    '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'
+]
+
+# Columns parsed for the summary and their dtypes. Amounts are read straight into float64; dates and day
+# counts stay strings so pandas can coerce unparseable values to NaT/NaN instead of failing the read.
+SUMMARY_DTYPES = {
+    'Date Acquired': 'str',
+    'Cost basis (USD)': 'float64',
+    'Date of Disposition': 'str',
+    'Proceeds (USD)': 'float64',
+    'Gains (Losses) (USD)': 'float64',
+    'Holding period (Days)': 'str'
+}
+
+def iter_csv_chunks(csv_path, sep, dtype, chunksize, use_pyarrow=True):
     """
-    Determine if a holding period is short-term or long-term based on acquisition and disposition dates.
+    Read selected CSV columns as a stream of DataFrames.
+
+    Uses PyArrow's streaming CSV reader for files when PyArrow is installed, otherwise pandas' C parser.
 
     Args:
-        date_acquired_str (str): Date the asset was acquired (e.g., '2024-01-01').
-        date_disposed_str (str): Date the asset was disposed of (e.g., '2024-12-31').
+        csv_path (str or file-like): Path to the CSV file, or a file-like object positioned at its start.
+        sep (str): Field delimiter.
+        dtype (dict): CSV column names to parse, mapped to their dtype ('float64' or 'str').
+                      All other columns are skipped.
+        chunksize (int): Number of rows per DataFrame with the pandas parser. PyArrow reads
+                         fixed-size byte blocks instead, so its chunks vary in row count.
+        use_pyarrow (bool): Whether files may be read with PyArrow. Defaults to True.
+
+    Yields:
+        pandas.DataFrame: The next chunk of rows, with only the requested columns.
+    """
+    # Both readers parse files straight out of a memory map instead of copying them through a read buffer
+    is_path = isinstance(csv_path, (str, os.PathLike))
+    if not use_pyarrow or pa_csv is None or not is_path:
+        yield from pd.read_csv(csv_path, sep=sep, usecols=list(dtype), dtype=dtype, chunksize=chunksize,
+                               engine='c', memory_map=is_path)
+        return
+
+    column_types = {col: pa.type_for_alias(col_dtype) for col, col_dtype in dtype.items()}
+    with pa.memory_map(os.fspath(csv_path)) as source:
+        reader = pa_csv.open_csv(
+            source,
+            parse_options=pa_csv.ParseOptions(delimiter=sep),
+            convert_options=pa_csv.ConvertOptions(include_columns=list(dtype), column_types=column_types)
+        )
+        for batch in reader:
+            yield batch.to_pandas()
+
+def _split_gains_loop(holding_days, gains, nan_is_long_term):
+    short_term_gains = 0.0
+    long_term_gains = 0.0
+    for i in range(holding_days.shape[0]):
+        gain = gains[i]
+        if np.isnan(gain):
+            continue
+        days = holding_days[i]
+        if days < 365:
+            short_term_gains += gain
+        elif nan_is_long_term or days >= 365:
+            long_term_gains += gain
+    return short_term_gains, long_term_gains
+
+@functools.lru_cache(maxsize=None)
+def _split_gains_kernel():
+    """Compile _split_gains_loop with Numba on first use, loading it from Numba's on-disk cache when possible."""
+    from numba import njit
+
+    # No fastmath: it assumes no NaNs, and NaN day counts and gains carry meaning here
+    return njit(cache=True)(_split_gains_loop)
+
+def split_gains_by_holding_period(holding_days, gains, nan_is_long_term):
+    """
+    Sum gains/losses into short-term (held < 365 days) and long-term totals.
+
+    Runs as a single fused loop compiled with Numba for arrays of at least NUMBA_MIN_ROWS rows when it is
+    installed, otherwise as NumPy masked sums.
+
+    Args:
+        holding_days (numpy.ndarray): Holding period of each row in days (float64, NaN if unknown).
+        gains (numpy.ndarray): Gain/loss of each row (float64); NaN gains are skipped.
+        nan_is_long_term (bool): Whether rows with an unknown holding period count as long-term
+                                 (otherwise they are excluded from both totals).
 
     Returns:
-        str: 'Short-term' if held < 365 days, 'Long-term' otherwise.
+        tuple: (short_term_gains, long_term_gains), as numpy.float64
     """
-    try:
-        # Explicitly specify the date format to avoid ambiguity
-        date_acquired = pd.to_datetime(date_acquired_str, format='%Y-%m-%d', utc=True)
-        date_disposed = pd.to_datetime(date_disposed_str, format='%Y-%m-%d', utc=True)
-        # Calculate the holding period in days, ensuring whole days
-        holding_days = (date_disposed.date() - date_acquired.date()).days
-        return 'Short-term' if holding_days < 365 else 'Long-term'
-    except Exception as e:
-        print(f"Error processing dates: {e}")
-        return None
+    if HAS_NUMBA and holding_days.shape[0] >= NUMBA_MIN_ROWS:
+        short_term_gains, long_term_gains = _split_gains_kernel()(holding_days, gains, nan_is_long_term)
+        return np.float64(short_term_gains), np.float64(long_term_gains)
+    short_mask = holding_days < 365
+    # NaN compares False against both bounds, so it only lands in long_mask when negated
+    long_mask = ~short_mask if nan_is_long_term else holding_days >= 365
+    return np.nansum(gains[short_mask]), np.nansum(gains[long_mask])
+
+def summarize_with_polars(csv_path, sep, dtype, column_mapping):
+    """
+    Calculate the crypto summary with a streaming Polars query over the CSV (a second one reads the
+    dates when every day count is empty).
+
+    Applies the same classification rules as the pandas path, but lets Polars' lazy engine parse only
+    the needed columns and reduce them without materializing intermediate columns.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        sep (str): Field delimiter.
+        dtype (dict): CSV column names to parse, mapped to their dtype ('float64' or 'str').
+        column_mapping (dict): CSV column names mapped to their standard column names.
+
+    Returns:
+        dict: Summary with totals for short-term and long-term gains/losses, proceeds, and cost basis.
+    """
+    import polars as pl
+
+    # Every column is read as a string; amounts are then parsed like pandas does, ignoring surrounding
+    # whitespace and still failing the read on any other non-numeric value
+    transactions = (
+        pl.scan_csv(csv_path, separator=sep, infer_schema=False, null_values=PANDAS_NA_VALUES)
+        .select(
+            pl.col(col).str.strip_chars().cast(pl.Float64) if col_dtype == 'float64' else pl.col(col)
+            for col, col_dtype in dtype.items()
+        )
+        .rename({csv_col: std_col for csv_col, std_col in column_mapping.items() if csv_col in dtype})
+    )
+    # NaN amounts are skipped like in the pandas path
+    gains = pl.col('Gains (Losses) (USD)').fill_nan(None)
+    totals = {
+        'total_proceeds': pl.col('Proceeds (USD)').fill_nan(None).sum(),
+        'total_cost_basis': pl.col('Cost basis (USD)').fill_nan(None).sum()
+    }
+
+    summary = {}
+    if 'Holding period (Days)' in dtype:
+        holding_days = pl.col('Holding period (Days)').str.strip_chars().cast(pl.Float64, strict=False).fill_nan(None)
+        # Rows without a day count fall through to long-term
+        is_short_term = (holding_days < 365).fill_null(False)
+        summary = transactions.select(
+            short_term_gains_losses=gains.filter(is_short_term).sum(),
+            long_term_gains_losses=gains.filter(~is_short_term).sum(),
+            has_holding_days=holding_days.is_not_null().any(),
+            **totals
+        ).collect(engine='streaming').row(0, named=True)
+        if summary.pop('has_holding_days'):
+            return summary
+        # Every day count is empty, so fall back to the dates for the gain/loss split; the totals are already done
+        totals = {}
+
+    # Unparseable dates give a null holding period, which matches neither filter and is excluded from the totals
+    date_acquired = pl.col('Date Acquired').str.strptime(pl.Date, '%Y-%m-%d', strict=False)
+    date_disposed = pl.col('Date of Disposition').str.strptime(pl.Date, '%Y-%m-%d', strict=False)
+    holding_days = (date_disposed - date_acquired).dt.total_days()
+    date_summary = transactions.select(
+        short_term_gains_losses=gains.filter(holding_days < 365).sum(),
+        long_term_gains_losses=gains.filter(holding_days >= 365).sum(),
+        unparsed_date_rows=holding_days.is_null().sum(),
+        **totals
+    ).collect(engine='streaming').row(0, named=True)
+    unparsed_date_rows = date_summary.pop('unparsed_date_rows')
+    if unparsed_date_rows:
+        logger.warning("Failed to parse dates for %d rows; they are excluded from the gain/loss totals.", unparsed_date_rows)
+    summary.update(date_summary)
+    return summary
 
-def map_column_name(column, column_mappings):
+def map_required_columns(columns):
     """
-    Map a column name to a standard required column name if it matches any alias.
+    Map column names to the standard required column names using their aliases.
 
     Args:
-        column (str): The column name from the CSV.
-        column_mappings (dict): Mapping of standard names to possible aliases.
+        columns (iterable): Column names, e.g. a CSV header.
 
     Returns:
-        str or None: The standard column name if matched, None otherwise.
+        dict: Each column that matches an alias, mapped to its standard column name. Extra columns are left out.
+
+    Raises:
+        ValueError: If any required column has no matching column.
+    """
+    # Normalize all column names at once (remove whitespace, lowercase) and look each one up
+    columns = pd.Index(columns)
+    normalized_columns = columns.astype(str).str.strip().str.lower()
+    column_mapping = {
+        column: std_col
+        for column, std_col in zip(columns, normalized_columns.map(ALIAS_LOOKUP))
+        # Allow extra columns that aren’t required
+        if pd.notna(std_col)
+    }
+
+    # Check if all required columns are present (standard names are their own first alias, so direct matches are mapped too)
+    mapped_columns = set(column_mapping.values())
+    missing = [std_col for std_col in REQUIRED_COLUMNS if std_col not in mapped_columns]
+    if missing:
+        possible_aliases = ', '.join(f"{std_col} ({', '.join(aliases)})" for std_col, aliases in REQUIRED_COLUMNS.items())
+        raise ValueError(f"Missing required columns: {missing}. Possible aliases include: {possible_aliases}")
+    return column_mapping
+
+def summarize_chunks(chunks):
+    """
+    Accumulate the crypto summary over a stream of transaction DataFrames.
+
+    Args:
+        chunks (iterable): DataFrames with standard column names, holding at least the amount and date
+                           columns and optionally 'Holding period (Days)'.
+
+    Returns:
+        dict: Summary with totals for short-term and long-term gains/losses, proceeds, and cost basis.
+
+    Raises:
+        ValueError: If the dates are needed for classification but missing.
     """
-    column = str(column).strip().lower()  # Normalize the column name (remove whitespace, lowercase)
-    for standard_name, aliases in column_mappings.items():
-        if column in [alias.strip().lower() for alias in aliases]:
-            return standard_name
-    return None
+    # 'Holding period (Days)' is used if it has any value in the data, otherwise the dates are, so both
+    # totals are tracked until that is known; the date-based ones only for chunks with no day counts.
+    days_short_term_gains = days_long_term_gains = 0.0
+    dates_short_term_gains = dates_long_term_gains = 0.0
+    unparsed_date_rows = 0
+    total_proceeds = total_cost_basis = 0.0
+    has_holding_days = False
+    for chunk in chunks:
+        logger.debug("Read chunk: rows=%d cols=%d", len(chunk), chunk.shape[1])
+        # Pull the three amount columns out as one float64 block: gains, proceeds, cost basis
+        amounts = chunk[['Gains (Losses) (USD)', 'Proceeds (USD)', 'Cost basis (USD)']].to_numpy(dtype=np.float64)
+        gains = amounts[:, 0]
+
+        if 'Holding period (Days)' in chunk.columns:
+            # Ensure 'Holding period (Days)' is numeric
+            holding_days = pd.to_numeric(chunk['Holding period (Days)'], errors='coerce').to_numpy(dtype=np.float64)
+            has_holding_days = has_holding_days or not np.isnan(holding_days).all()
+            # Rows without a day count fall through to long-term
+            chunk_short_term_gains, chunk_long_term_gains = split_gains_by_holding_period(holding_days, gains, True)
+            days_short_term_gains += chunk_short_term_gains
+            days_long_term_gains += chunk_long_term_gains
+
+        if not has_holding_days:
+            if 'Date Acquired' not in chunk.columns or 'Date of Disposition' not in chunk.columns:
+                raise ValueError("Missing 'Date Acquired' or 'Date of Disposition' for date-based holding period calculation.")
+            # Parse both date columns in one vectorized pass each; unparseable dates become NaT.
+            # Many lots share dates, so cache=True parses each distinct date string only once.
+            date_acquired = pd.to_datetime(chunk['Date Acquired'], format='%Y-%m-%d', utc=True, errors='coerce', cache=True)
+            date_disposed = pd.to_datetime(chunk['Date of Disposition'], format='%Y-%m-%d', utc=True, errors='coerce', cache=True)
+            # Calculate the holding period in whole days (NaN where either date is missing)
+            holding_days = (date_disposed - date_acquired).dt.days.to_numpy(dtype=np.float64)
+            unparsed_date_rows += int(np.isnan(holding_days).sum())
+            # Rows with unparseable dates are excluded from the gain/loss totals
+            chunk_short_term_gains, chunk_long_term_gains = split_gains_by_holding_period(holding_days, gains, False)
+            dates_short_term_gains += chunk_short_term_gains
+            dates_long_term_gains += chunk_long_term_gains
+
+        # Additional totals for TurboTax, reduced together in one pass over the block
+        chunk_proceeds, chunk_cost_basis = np.nansum(amounts[:, 1:], axis=0)
+        total_proceeds += chunk_proceeds
+        total_cost_basis += chunk_cost_basis
+
+    # Combine results into a dictionary
+    if has_holding_days:
+        short_term_gains, long_term_gains = days_short_term_gains, days_long_term_gains
+    else:
+        short_term_gains, long_term_gains = dates_short_term_gains, dates_long_term_gains
+        if unparsed_date_rows:
+            logger.warning("Failed to parse dates for %d rows; they are excluded from the gain/loss totals.", unparsed_date_rows)
+    result = {
+        'short_term_gains_losses': short_term_gains,
+        'long_term_gains_losses': long_term_gains,
+        'total_proceeds': total_proceeds,
+        'total_cost_basis': total_cost_basis
+    }
+    return result
 
-def calculate_crypto_summary(csv_path):
+def calculate_crypto_summary_from_dataframe(df):
+    """
+    Calculate the crypto summary from transactions already loaded into a DataFrame.
+
+    Skips CSV parsing entirely. The date columns may hold 'YYYY-MM-DD' strings or be datetime64 already.
+
+    Args:
+        df (pandas.DataFrame): Transactions with the same columns (or aliases) as the CSV accepted by
+                               calculate_crypto_summary.
+
+    Returns:
+        dict: Summary with totals for short-term and long-term gains/losses, proceeds, and cost basis.
+
+    Raises:
+        ValueError: If required columns are missing.
+    """
+    column_mapping = map_required_columns(df.columns)
+    columns = [column for column, std_col in column_mapping.items() if std_col in SUMMARY_DTYPES]
+    if 'Holding period (Days)' in df.columns:
+        columns.append('Holding period (Days)')
+    return summarize_chunks([df[columns].rename(columns=column_mapping)])
+
+def calculate_crypto_summary(csv_path, chunksize=100_000):
     """
     Calculate a summary of crypto transactions for tax purposes, categorizing gains/losses
     as short-term or long-term.
 
     Args:
-        csv_path (str): Path to the CSV file containing crypto transaction data.
+        csv_path (str or file-like): Path to the CSV file containing crypto transaction data, or a
+                        file-like object (e.g. io.StringIO) with the same contents.
                         The CSV should include columns like 'Transaction Type', 'Transaction ID',
                         'Tax lot ID', 'Asset name', 'Amount', 'Date Acquired', 'Cost basis (USD)',
                         'Date of Disposition', 'Proceeds (USD)', 'Gains (Losses) (USD)',
                         'Holding period (Days)' (optional), 'Data source'. The header can be anywhere in the file.
+        chunksize (int): Number of rows read from the CSV at a time. Defaults to 100,000. It only applies to
+                         file-like objects and to files read with pandas: when PyArrow is installed, files are
+                         read in fixed-size byte blocks instead, and files of at least POLARS_MIN_FILE_SIZE bytes
+                         are streamed by Polars when it is installed.
 
     Returns:
         dict: Summary with totals for short-term and long-term gains/losses, proceeds, and cost basis.
@@ -62,95 +362,59 @@ def calculate_crypto_summary(csv_path):
         FileNotFoundError: If the CSV file is not found.
         ValueError: If required columns are missing or the CSV format is invalid.
     """
-    # Check if the file exists
-    if not os.path.exists(csv_path):
-        raise FileNotFoundError(f"CSV file not found at: {csv_path}")
+    # A file-like object is read more than once (header, then rows), so remember where it starts
+    start = None if isinstance(csv_path, (str, os.PathLike)) else csv_path.tell()
 
     try:
-        # Try reading the CSV with default settings, allowing pandas to infer the header
+        # Read only the header first, allowing pandas to infer it, so columns can be validated before the full read
+        sep = ','
         try:
-            df = pd.read_csv(csv_path)
+            header = pd.read_csv(csv_path, nrows=0)
         except pd.errors.ParserError:
             # If the default fails, try common delimiters (e.g., tab, semicolon)
-            for delimiter in [',', '\t', ';']:
+            for sep in [',', '\t', ';']:
+                if start is not None:
+                    csv_path.seek(start)
                 try:
-                    df = pd.read_csv(csv_path, sep=delimiter)
+                    header = pd.read_csv(csv_path, sep=sep, nrows=0)
                     break
                 except pd.errors.ParserError:
                     continue
             else:
                 raise ValueError("Invalid CSV format. Please ensure the file is a valid CSV with a header row and try specifying a delimiter (e.g., comma, tab, semicolon).")
 
-        # Define strictly required columns (excluding 'Holding period (Days)')
-        required_columns = {
-            'Transaction Type': ['Transaction Type', 'Trade Type', 'Type'],
-            'Transaction ID': ['Transaction ID', 'Trade ID', 'ID'],
-            'Tax lot ID': ['Tax lot ID', 'Lot ID', 'Tax Lot'],
-            'Asset name': ['Asset name', 'Currency', 'Symbol'],
-            'Amount': ['Amount', 'Quantity'],
-            'Date Acquired': ['Date Acquired', 'Acquisition Date', 'Bought Date'],
-            'Cost basis (USD)': ['Cost basis (USD)', 'Cost Basis', 'Purchase Price (USD)'],
-            'Date of Disposition': ['Date of Disposition', 'Disposition Date', 'Sold Date'],
-            'Proceeds (USD)': ['Proceeds (USD)', 'Sale Proceeds', 'Sale Price (USD)'],
-            'Gains (Losses) (USD)': ['Gains (Losses) (USD)', 'Gain/Loss (USD)', 'Profit/Loss (USD)'],
-            'Data source': ['Data source', 'Source', 'Exchange']
-        }
-
-        # Map CSV columns to required columns using aliases
-        column_mapping = {}
-        for csv_col in df.columns:
-            for std_col, aliases in required_columns.items():
-                if map_column_name(csv_col, {std_col: aliases}):
-                    column_mapping[csv_col] = std_col
-                    break
-            else:
-                # Allow extra columns that aren’t required
-                continue
+        column_mapping = map_required_columns(header.columns)
+
+        # Only the columns feeding the summary are parsed, with pinned dtypes; the rest were just validated above
+        dtype = {csv_col: SUMMARY_DTYPES[std_col] for csv_col, std_col in column_mapping.items() if std_col in SUMMARY_DTYPES}
+        if 'Holding period (Days)' in header.columns:
+            dtype['Holding period (Days)'] = SUMMARY_DTYPES['Holding period (Days)']
 
-        # Check if all required columns are present (via mapping or direct match)
-        missing = []
-        for std_col, aliases in required_columns.items():
-            if not any(std_col in column_mapping.values() or map_column_name(col, {std_col: aliases}) for col in df.columns):
-                missing.append(std_col)
-        if missing:
-            raise ValueError(f"Missing required columns: {missing}. Possible aliases include: {', '.join([f'{k} ({", ".join(v)})' for k, v in required_columns.items()])}")
+        if start is not None:
+            csv_path.seek(start)
+        elif HAS_POLARS and os.path.getsize(csv_path) >= POLARS_MIN_FILE_SIZE:
+            import polars as pl
+            try:
+                return summarize_with_polars(csv_path, sep, dtype, column_mapping)
+            except pl.exceptions.PolarsError as e:
+                raise ValueError(f"Invalid CSV format: {e}")
 
+        # Stream the rows in chunks and keep running totals, so memory stays bounded by the chunk size
+        if start is None and pa_csv is not None:
+            try:
+                chunks = iter_csv_chunks(csv_path, sep, dtype, chunksize)
+                return summarize_chunks(chunk.rename(columns=column_mapping) for chunk in chunks)
+            except pa.ArrowInvalid as e:
+                # PyArrow rejects rows with more or fewer fields than the header, which pandas reads
+                # (padding short rows with NaN), so redo the whole read with pandas
+                logger.debug("PyArrow could not parse the CSV, reading it with pandas instead: %s", e)
+        chunks = iter_csv_chunks(csv_path, sep, dtype, chunksize, use_pyarrow=False)
         # Rename columns to standardize for processing
-        df = df.rename(columns=column_mapping)
-
-        # Ensure 'Holding period (Days)' is numeric if it exists
-        if 'Holding period (Days)' in df.columns:
-            df['Holding period (Days)'] = pd.to_numeric(df['Holding period (Days)'], errors='coerce')
-
-        # Use 'Holding period (Days)' if present and not all NaN, otherwise fall back to date-based classification
-        if 'Holding period (Days)' in df.columns and not df['Holding period (Days)'].isna().all():
-            df['Holding period'] = df['Holding period (Days)'].apply(
-                lambda days: 'Short-term' if pd.notna(days) and days < 365 else 'Long-term'
-            )
-        else:
-            if 'Date Acquired' not in df.columns or 'Date of Disposition' not in df.columns:
-                raise ValueError("Missing 'Date Acquired' or 'Date of Disposition' for date-based holding period calculation.")
-            df['Holding period'] = df.apply(
-                lambda row: classify_holding_period(row['Date Acquired'], row['Date of Disposition']),
-                axis=1
-            )
-
-        # Calculate totals for gains/losses by holding period
-        summary = df.groupby('Holding period')['Gains (Losses) (USD)'].sum().to_dict()
-
-        # Additional totals for TurboTax
-        total_proceeds = df['Proceeds (USD)'].sum()
-        total_cost_basis = df['Cost basis (USD)'].sum()
-
-        # Combine results into a dictionary
-        result = {
-            'short_term_gains_losses': summary.get('Short-term', 0),
-            'long_term_gains_losses': summary.get('Long-term', 0),
-            'total_proceeds': total_proceeds,
-            'total_cost_basis': total_cost_basis
-        }
-        return result
+        return summarize_chunks(chunk.rename(columns=column_mapping) for chunk in chunks)
 
+    except FileNotFoundError:
+        # Let the read itself detect a missing file rather than checking up front
+        raise FileNotFoundError(f"CSV file not found at: {csv_path}")
     except pd.errors.EmptyDataError:
         raise ValueError("The CSV file is empty or contains no data after the header.")
     except pd.errors.ParserError:
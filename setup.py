@@ -1,10 +1,14 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 setup(
     name='cryptotax_summary',
     version='0.1.3',
-    packages=find_packages(),
-    install_requires=['pandas'],
+    packages=['cryptotax_summary'],
+    install_requires=['numpy', 'pandas'],
+    extras_require={
+        'fast': ['numba', 'polars>=1.25', 'pyarrow'],
+        'test': ['pytest']
+    },
     author='Your Name',
     author_email='Abhinay.Yarlagadda@gmail.com',
     description='A library to summarize crypto transactions for tax reporting',
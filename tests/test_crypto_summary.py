@@ -1,68 +1,209 @@
-import unittest
-from cryptotax_summary import calculate_crypto_summary
+import csv
+import io
+from cryptotax_summary import calculate_crypto_summary, calculate_crypto_summary_from_dataframe
+from cryptotax_summary import crypto_summary
+import numpy as np
 import pandas as pd
-import os
-
-class TestCryptoSummary(unittest.TestCase):
-    def setUp(self):
-        # Create a sample CSV file for testing with a header at the top
-        data = {
-            'Transaction Type': ['Trade', 'Sell'],
-            'Transaction ID': ['1', '2'],
-            'Tax lot ID': ['A', 'B'],
-            'Asset name': ['BTC', 'ETH'],
-            'Amount': [1.0, 0.5],
-            'Date Acquired': ['2024-01-01', '2024-06-01'],
-            'Cost basis (USD)': [40000, 2000],
-            'Date of Disposition': ['2024-12-31', '2024-12-31'],
-            'Proceeds (USD)': [50000, 2500],
-            'Gains (Losses) (USD)': [10000, 500],
-            'Holding period (Days)': [365, 183],
-            'Data source': ['Coinbase', 'Coinbase']
-        }
-        df = pd.DataFrame(data)
-
-        # Write the CSV with the header at the top (no extra lines)
-        df.to_csv('test_transactions.csv', index=False)
-
-    def test_summary_calculation(self):
-        # Run the summary
-        summary = calculate_crypto_summary('test_transactions.csv')
-        self.assertIn('short_term_gains_losses', summary)
-        self.assertIn('long_term_gains_losses', summary)
-        self.assertEqual(summary['short_term_gains_losses'], 500)  # Short-term gain
-        self.assertEqual(summary['long_term_gains_losses'], 10000)  # Long-term gain
-
-    def test_missing_holding_period(self):
-        # Test with a CSV missing Holding period (Days), relying on dates
-        data = {
-            'Transaction Type': ['Sale', 'Sale'],
-            'Transaction ID': ['1', '2'],
-            'Tax lot ID': ['A', 'B'],
-            'Asset name': ['BTC', 'ETH'],
-            'Amount': [1.0, 0.5],
-            'Date Acquired': ['2024-01-01', '2024-06-01'],
-            'Cost basis (USD)': [40000, 2000],
-            'Date of Disposition': ['2024-12-31', '2024-12-31'],
-            'Proceeds (USD)': [50000, 2500],
-            'Gains (Losses) (USD)': [10000, 500],
-            'Data source': ['Exchange', 'Exchange']
-        }
-        df = pd.DataFrame(data)
-
-        df.to_csv('test_transactions_no_days.csv', index=False)
-
-        summary = calculate_crypto_summary('test_transactions_no_days.csv')
-        self.assertEqual(summary['short_term_gains_losses'], 500)  # Short-term gain
-        self.assertEqual(summary['long_term_gains_losses'], 10000)  # Long-term gain
-
-        if os.path.exists('test_transactions_no_days.csv'):
-            os.remove('test_transactions_no_days.csv')
-
-    def tearDown(self):
-        # Clean up: remove the test CSV file after the test
-        if os.path.exists('test_transactions.csv'):
-            os.remove('test_transactions.csv')
-
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+import pytest
+
+# Sample transactions (header first), written to disk as rows and read back as text from in-memory buffers
+_ROWS = [
+    ['Transaction Type', 'Transaction ID', 'Tax lot ID', 'Asset name', 'Amount', 'Date Acquired', 'Cost basis (USD)',
+     'Date of Disposition', 'Proceeds (USD)', 'Gains (Losses) (USD)', 'Holding period (Days)', 'Data source'],
+    ['Trade', '1', 'A', 'BTC', '1.0', '2024-01-01', '40000', '2024-12-31', '50000', '10000', '365', 'Coinbase'],
+    ['Sell', '2', 'B', 'ETH', '0.5', '2024-06-01', '2000', '2024-12-31', '2500', '500', '183', 'Coinbase']
+]
+# No field needs quoting, so joining on commas gives the same text csv.writer would
+_HEADER = ','.join(_ROWS[0]) + '\n'
+_CSV = _HEADER + ''.join(','.join(row) + '\n' for row in _ROWS[1:])
+
+def _write_rows(path, rows, nblank=0):
+    """Write rows (header first) to path as CSV, after nblank blank lines."""
+    with open(path, 'w', newline='') as f:
+        f.write('\n' * nblank)
+        csv.writer(f, lineterminator='\n').writerows(rows)
+
+def _with_transaction_types(csv_text, types):
+    """Replace the 'Transaction Type' value of each data row in csv_text."""
+    header, *rows = csv_text.splitlines(keepends=True)
+    return header + ''.join(f"{txn_type},{row.split(',', 1)[1]}" for txn_type, row in zip(types, rows))
+
+@pytest.fixture(scope='module')
+def sample_df():
+    # Load the sample into a DataFrame once for the DataFrame entry point, with narrow
+    # amount dtypes and the dates already parsed
+    return pd.read_csv(
+        io.StringIO(_CSV),
+        dtype={
+            'Transaction ID': 'str',
+            'Cost basis (USD)': 'float32',
+            'Proceeds (USD)': 'float32',
+            'Gains (Losses) (USD)': 'float32',
+            'Amount': 'float32',
+            'Holding period (Days)': 'int32'
+        },
+        parse_dates=['Date Acquired', 'Date of Disposition']
+    )
+
+@pytest.fixture(scope='module')
+def sample_summary():
+    # Summarize the sample once; tests that only inspect the result share it
+    return calculate_crypto_summary(io.StringIO(_CSV))
+
+@pytest.fixture
+def csv_path(tmp_path):
+    # A unique path per test, so tests can run in parallel without clobbering each other's files
+    return tmp_path / 'transactions.csv'
+
+def test_summary_calculation(sample_summary):
+    assert 'short_term_gains_losses' in sample_summary
+    assert 'long_term_gains_losses' in sample_summary
+    assert sample_summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert sample_summary['long_term_gains_losses'] == 10000  # Long-term gain
+
+def test_totals(sample_summary):
+    assert sample_summary['total_proceeds'] == 52500
+    assert sample_summary['total_cost_basis'] == 42000
+
+# (Transaction Type values, blank lines before the header) must not change the summary
+@pytest.mark.parametrize('types, nblank', [(['Sale', 'Sale'], 7), (['Trade', 'Sell'], 0)])
+def test_transaction_types_and_blank_lines(types, nblank):
+    csv_text = '\n' * nblank + _with_transaction_types(_CSV, types)
+    summary = calculate_crypto_summary(io.StringIO(csv_text))
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10000  # Long-term gain
+
+def test_csv_file_path(csv_path, monkeypatch):
+    # The same summary when reading from a file on disk whose header comes after blank lines
+    _write_rows(csv_path, _ROWS, nblank=7)
+
+    summary = calculate_crypto_summary(csv_path)
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10000  # Long-term gain
+    # A string path reads the same file
+    assert calculate_crypto_summary(str(csv_path)) == summary
+    # The pandas reader matches PyArrow's when PyArrow is installed
+    monkeypatch.setattr(crypto_summary, 'pa_csv', None)
+    assert calculate_crypto_summary(csv_path) == summary
+
+@pytest.mark.parametrize('use_pyarrow', [True, False])
+def test_ragged_rows(csv_path, monkeypatch, use_pyarrow):
+    # A short row is padded with NaN and a row with an extra field is read as usual, with either reader
+    if use_pyarrow and crypto_summary.pa_csv is None:
+        pytest.skip('pyarrow is not installed')
+    if not use_pyarrow:
+        monkeypatch.setattr(crypto_summary, 'pa_csv', None)
+    csv_path.write_text(_HEADER + """Trade,1,A,BTC,1.0,2024-01-01,40000,2024-12-31,50000,10000,365,Coinbase
+Sell,2,B,ETH,0.5,2024-06-01,2000,2024-12-31,2500,500
+Sell,3,C,SOL,2.0,2024-09-01,300,2024-12-31,400,100,121,Coinbase,extra
+""")
+
+    summary = calculate_crypto_summary(csv_path)
+    assert summary['short_term_gains_losses'] == 100  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10500  # Missing day count counts as long-term
+    assert summary['total_proceeds'] == 52900
+
+def test_missing_holding_period(sample_df):
+    # Test with transactions missing Holding period (Days), relying on the already parsed dates
+    summary = calculate_crypto_summary_from_dataframe(sample_df.drop(columns=['Holding period (Days)']))
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10000  # Long-term gain
+
+def test_chunked_read():
+    # A day count anywhere in the file applies to every chunk, even one with no day counts
+    csv_text = _HEADER + """Sale,1,A,BTC,1.0,2024-06-01,40000,2024-12-31,50000,10000,,Exchange
+Sale,2,B,ETH,0.5,2024-06-01,2000,2024-12-31,2500,500,183,Exchange
+"""
+
+    summary = calculate_crypto_summary(io.StringIO(csv_text), chunksize=1)
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10000  # Missing day count counts as long-term
+    assert summary['total_proceeds'] == 52500
+    assert summary['total_cost_basis'] == 42000
+
+@pytest.mark.skipif(crypto_summary.pa_csv is None, reason='pyarrow is not installed')
+def test_pyarrow_blocks_match_pandas(csv_path, monkeypatch):
+    # Enough rows to span more than one of PyArrow's 1 MiB blocks; only the last row has a day count
+    csv_path.write_text(_HEADER + 'Sale,1,A,BTC,1.0,2024-06-01,40000,2024-12-31,50000,10000,,Exchange\n' * 20_000
+                        + 'Sale,2,B,ETH,0.5,2024-06-01,2000,2024-12-31,2500,500,183,Exchange\n')
+
+    summary = calculate_crypto_summary(csv_path)
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 200_000_000  # Missing day counts count as long-term
+    monkeypatch.setattr(crypto_summary, 'pa_csv', None)
+    assert calculate_crypto_summary(csv_path, chunksize=1_000) == summary
+
+def test_unparseable_dates_excluded(caplog):
+    # Rows whose dates cannot be parsed are left out of the gain/loss totals
+    csv_text = """Transaction Type,Transaction ID,Tax lot ID,Asset name,Amount,Date Acquired,Cost basis (USD),Date of Disposition,Proceeds (USD),Gains (Losses) (USD),Data source
+Sale,1,A,BTC,1.0,2024-01-01,40000,2024-12-31,50000,10000,Exchange
+Sale,2,B,ETH,0.5,2024-06-01,2000,2024-12-31,2500,500,Exchange
+Sale,3,C,SOL,2.0,not a date,300,2024-12-31,400,100,Exchange
+"""
+
+    with caplog.at_level('WARNING', logger='cryptotax_summary.crypto_summary'):
+        summary = calculate_crypto_summary(io.StringIO(csv_text))
+    assert 'Failed to parse dates for 1 rows' in caplog.text
+    assert summary['short_term_gains_losses'] == 500  # Short-term gain
+    assert summary['long_term_gains_losses'] == 10000  # Long-term gain
+    assert summary['total_proceeds'] == 52900
+
+def test_missing_required_columns(sample_df):
+    # Dropping a required column (and all of its aliases) is reported by name
+    with pytest.raises(ValueError, match=r"Missing required columns: \['Tax lot ID'\]"):
+        calculate_crypto_summary_from_dataframe(sample_df.drop(columns=['Tax lot ID']))
+
+@pytest.mark.skipif(not crypto_summary.HAS_POLARS, reason='polars is not installed')
+@pytest.mark.parametrize('variant', ['with_days', 'without_days', 'bad_dates', 'na_amounts'])
+def test_polars_matches_pandas(csv_path, monkeypatch, variant):
+    # Force the Polars path for a small file and compare against the chunked pandas path
+    rows = [list(row) for row in _ROWS]
+    days = rows[0].index('Holding period (Days)')
+    rows[2][days] = ''
+    if variant in ('without_days', 'bad_dates'):
+        rows = [row[:days] + row[days + 1:] for row in rows]
+    if variant == 'bad_dates':
+        rows[2][rows[0].index('Date Acquired')] = 'bad'
+    if variant == 'na_amounts':
+        # pandas reads its default NA strings as NaN and ignores whitespace around numbers
+        rows[1][rows[0].index('Gains (Losses) (USD)')] = 'N/A'
+        rows[2][rows[0].index('Proceeds (USD)')] = ' 2500 '
+    _write_rows(csv_path, rows)
+
+    expected = calculate_crypto_summary(csv_path)
+    monkeypatch.setattr(crypto_summary, 'POLARS_MIN_FILE_SIZE', 0)
+    assert calculate_crypto_summary(csv_path) == expected
+
+@pytest.mark.skipif(not crypto_summary.HAS_POLARS, reason='polars is not installed')
+def test_polars_errors_raise_value_error(csv_path, monkeypatch):
+    # Any Polars error, not just a parse failure, is reported as an invalid CSV
+    import polars as pl
+
+    def summarize_with_polars(*args):
+        raise pl.exceptions.DuplicateError("column 'Gains (Losses) (USD)' is duplicate")
+
+    csv_path.write_text(_CSV)
+    monkeypatch.setattr(crypto_summary, 'POLARS_MIN_FILE_SIZE', 0)
+    monkeypatch.setattr(crypto_summary, 'summarize_with_polars', summarize_with_polars)
+    with pytest.raises(ValueError, match='Invalid CSV format: column .* is duplicate'):
+        calculate_crypto_summary(csv_path)
+
+@pytest.mark.parametrize('use_numba', [False, True])
+def test_split_gains_by_holding_period(monkeypatch, use_numba):
+    # The Numba kernel and the NumPy masked sums give the same totals, as numpy.float64
+    if use_numba:
+        if not crypto_summary.HAS_NUMBA:
+            pytest.skip('numba is not installed')
+        monkeypatch.setattr(crypto_summary, 'NUMBA_MIN_ROWS', 0)
+    else:
+        monkeypatch.setattr(crypto_summary, 'HAS_NUMBA', False)
+    holding_days = np.array([10.0, 400.0, np.nan, 364.0, 365.0])
+    gains = np.array([1.0, 2.0, 4.0, np.nan, 8.0])
+    totals = crypto_summary.split_gains_by_holding_period(holding_days, gains, True)
+    assert totals == (1.0, 14.0)
+    assert all(type(total) is np.float64 for total in totals)
+    assert crypto_summary.split_gains_by_holding_period(holding_days, gains, False) == (1.0, 10.0)
+
+def test_file_not_found():
+    with pytest.raises(FileNotFoundError, match='CSV file not found at: missing_transactions.csv'):
+        calculate_crypto_summary('missing_transactions.csv')